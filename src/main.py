@@ -1,9 +1,13 @@
 """
 ai-music-arranger - An AI-powered music arrangement tool that helps musicians generate harmonies, chord progressions, and rhythmic patterns based on user input. The tool provides a creative way to explore new musical ideas and enhance composition workflows.
 """
+import logging
 
 def main():
     """Main function."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s')
     print("Hello from ai-music-arranger!")
 
 if __name__ == "__main__":
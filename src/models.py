@@ -1,12 +1,18 @@
 import logging
-import re
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional
 import numpy as np
+from operator import attrgetter
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Column layout used by notes_to_array: pitch names alongside numeric columns
+_PITCH_WIDTH = 4
+NOTE_DTYPE = np.dtype([
+    ('pitch', f'U{_PITCH_WIDTH}'), ('duration', 'f4'), ('timing', 'f4'),
+])
+_NOTE_FIELDS = attrgetter('pitch', 'duration', 'timing')
+
 class MusicNote(BaseModel):
     """Represents a single musical note with pitch, duration, and timing."""
     pitch: str
@@ -18,7 +24,9 @@ class MusicNote(BaseModel):
         """Validate that the pitch is in a standard format (e.g., 'C4', 'A#3')."""
         if not isinstance(value, str):
             raise ValueError("Pitch must be a string")
-        if not re.match(r'^[A-G][#b]?[0-9]+$', value):
+        octave = value[2:] if value[1:2] in ('#', 'b') else value[1:]
+        if (not value or value[0] not in 'ABCDEFG'
+                or not (octave.isascii() and octave.isdigit())):
             raise ValueError(f"Invalid pitch format: {value}")
         return value
 
@@ -48,34 +56,61 @@ class RhythmicPattern(BaseModel):
             raise ValueError("Tempo must be a positive number")
         return value
 
-def validate_music_data(data: Dict) -> Dict:
+
+def validate_music_data(data: Dict, trusted: bool = False) -> Dict:
     """
     Validate and convert raw music data into Pydantic models.
     Returns a dictionary with validated notes, chords, and rhythm.
+    When trusted is True the data is assumed to be clean already (e.g. loaded
+    from an internal store) and models are built without running validators.
     """
-    logger.info("Validating music data")
+    logger.debug("Validating music data")
     try:
-        notes = [MusicNote(**note) for note in data.get('notes', [])]
-        chords = [ChordProgression(**chord) for chord in data.get('chords', [])]
-        rhythm = RhythmicPattern(**data.get('rhythm', {}))
+        if trusted:
+            notes = [MusicNote.model_construct(**note)
+                     for note in data.get('notes', [])]
+            chords = [
+                ChordProgression.model_construct(**{
+                    **chord,
+                    'notes': [MusicNote.model_construct(**note)
+                              for note in chord.get('notes', [])]
+                })
+                for chord in data.get('chords', [])
+            ]
+            rhythm = RhythmicPattern.model_construct(**data.get('rhythm', {}))
+        else:
+            notes = [MusicNote(**note) for note in data.get('notes', [])]
+            chords = [ChordProgression(**chord)
+                      for chord in data.get('chords', [])]
+            rhythm = RhythmicPattern(**data.get('rhythm', {}))
         return {
             'notes': notes,
             'chords': chords,
             'rhythm': rhythm
         }
     except Exception as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise ValueError(f"Invalid music data: {e}")
 
 def notes_to_array(notes: List[MusicNote]) -> np.ndarray:
     """
-    Convert a list of MusicNote objects to a numpy array for TensorFlow processing.
-    Each row contains pitch, duration, and timing values.
+    Convert a list of MusicNote objects to a structured numpy array for
+    TensorFlow processing. Each record holds pitch, duration, and timing
+    fields (see NOTE_DTYPE); numeric features can be taken as a float32
+    matrix with np.lib.recfunctions.structured_to_unstructured applied
+    to arr[['duration', 'timing']].
+    Raises ValueError for pitches too long for the pitch field rather than
+    truncating them.
     """
-    logger.info("Converting notes to numpy array")
+    logger.debug("Converting notes to numpy array")
+    arr = np.empty(len(notes), dtype=NOTE_DTYPE)
     if not notes:
-        return np.array([])
-    pitches = [note.pitch for note in notes]
-    durations = [note.duration for note in notes]
-    timings = [note.timing for note in notes]
-    return np.array([pitches, durations, timings]).T
\ No newline at end of file
+        return arr
+    pitches, durations, timings = zip(*map(_NOTE_FIELDS, notes))
+    longest = max(pitches, key=len)
+    if len(longest) > _PITCH_WIDTH:
+        raise ValueError(f"Pitch too long for array conversion: {longest}")
+    arr['pitch'] = pitches
+    arr['duration'] = durations
+    arr['timing'] = timings
+    return arr
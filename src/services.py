@@ -1,9 +1,40 @@
-import tensorflow as tf
 from pydantic import BaseModel, Field
 import logging
+import os
+import threading
 import numpy as np
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# TensorFlow is imported inside the functions that need it: the import is slow
+# and callers that only build or validate inputs never run the model.
+
+# One-hot chord vectors; unknown chords map to index -1, the trailing all-zero
+# row
+_CHORD_INDEX = {
+    "Cmaj7": 0, "G7": 1, "Am7": 2, "D7": 3, "Em7": 4, "A7": 5, "Fmaj7": 6,
+}
+_CHORD_WIDTH = len(_CHORD_INDEX)
+_CHORD_TABLE = np.eye(_CHORD_WIDTH + 1, _CHORD_WIDTH, dtype=np.float32)
+
+MODEL_PATH = "music_model"
+LEGACY_MODEL_PATH = "music_model.h5"
+
+# Input limits; features are zero-padded to the fixed model width set by the
+# melody and chord maxima
+MIN_MELODY = 5
+MAX_MELODY = 32
+MIN_CHORDS = 2
+MAX_CHORDS = 8
+MIN_TEMPO = 40
+MAX_TEMPO = 240
+
+# Batch sizes the inference function is compiled for. XLA compiles a new
+# program for every distinct input shape, so batches are zero-padded up to the
+# next bucket (and split above the largest) and every bucket is compiled up
+# front. Padding rows cost some wasted work per call, in exchange for never
+# compiling on the request path.
+BATCH_BUCKETS = (1, 8, 32)
 
 class MusicInput(BaseModel):
     """Model representing user input for music generation."""
@@ -11,66 +42,301 @@ class MusicInput(BaseModel):
     chords: list[str] = Field(..., description="List of chord names (e.g., 'Cmaj7', 'G7')")
     tempo: int = Field(..., description="BPM value for the rhythm")
 
+
+def convert_h5_to_savedmodel(h5_path: str = LEGACY_MODEL_PATH,
+                             export_dir: str = MODEL_PATH):
+    """Migrate a legacy Keras HDF5 model to the SavedModel format.
+
+    The export directory is what MusicService loads by default.
+    """
+    import tensorflow as tf
+
+    try:
+        model = tf.keras.models.load_model(h5_path, compile=False)
+        model.save(export_dir, save_format="tf")
+        logger.info("Converted %s to SavedModel at %s", h5_path, export_dir)
+    except Exception as e:
+        logger.error("Failed to convert model: %s", e)
+        raise
+
 class MusicService:
     """Service class for generating music arrangements using TensorFlow models."""
     
     def __init__(self):
-        """Initialize the service and load the TensorFlow model."""
+        """Initialize the service, load the model and trace its inference."""
+        self._D = MAX_MELODY + MAX_CHORDS * _CHORD_WIDTH + 1
         self.model = self._load_model()
+        width = self.model.input_shape[-1]
+        if width != self._D:
+            raise ValueError(f"Model input width {width} does not match the "
+                             f"feature width {self._D}")
+        self._infer = self._build_inference_fn()
+        # Compile every batch bucket before the first request
+        for size in BATCH_BUCKETS:
+            self._run_inference(np.zeros((size, self._D), dtype=np.float32))
+        self._int8_model = None
+        self._int8_lock = threading.Lock()
     
     def _load_model(self):
-        """Load the pre-trained TensorFlow model."""
+        """Load the pre-trained model, preferring the SavedModel export."""
+        import tensorflow as tf
+
         try:
-            model = tf.keras.models.load_model("music_model.h5")
-            logging.info("Model loaded successfully")
+            path = MODEL_PATH
+            if (not os.path.isdir(MODEL_PATH)
+                    and os.path.exists(LEGACY_MODEL_PATH)):
+                logger.warning(
+                    "SavedModel not found at %s, falling back to %s",
+                    MODEL_PATH, LEGACY_MODEL_PATH)
+                path = LEGACY_MODEL_PATH
+            model = tf.keras.models.load_model(path, compile=False)
+            logger.info("Model loaded successfully")
             return model
         except Exception as e:
-            logging.error(f"Failed to load model: {e}")
+            logger.error("Failed to load model: %s", e)
             raise
     
+    def _build_inference_fn(self):
+        """Trace the model once into an XLA-compiled concrete function."""
+        import tensorflow as tf
+
+        return tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec([None, self._D], tf.float32)],
+            jit_compile=True,
+        ).get_concrete_function()
+
+    def _run_inference(self, features: np.ndarray) -> np.ndarray:
+        """Run an (N, D) float32 feature array through the traced function."""
+        return self._run_in_buckets(features, self._call_model)
+
+    def _call_model(self, features: np.ndarray) -> np.ndarray:
+        """Call the traced function on one bucket-sized float32 batch."""
+        import tensorflow as tf
+
+        return self._infer(tf.convert_to_tensor(features)).numpy()
+
+    def _run_in_buckets(self, features: np.ndarray, run) -> np.ndarray:
+        """Run an (N, D) batch as bucket-sized calls and trim the padding."""
+        n = len(features)
+        largest = BATCH_BUCKETS[-1]
+        if n > largest:
+            return np.concatenate([
+                self._run_in_buckets(features[start:start + largest], run)
+                for start in range(0, n, largest)
+            ])
+        size = next(bucket for bucket in BATCH_BUCKETS if bucket >= n)
+        if size != n:
+            padded = np.zeros((size, features.shape[1]), dtype=features.dtype)
+            padded[:n] = features
+            features = padded
+        return run(features)[:n]
+
+    def enable_int8(self, calibration_inputs: list[MusicInput]):
+        """
+        Convert the model to a full-integer TFLite interpreter calibrated on
+        sample inputs.
+        Once enabled, generate_harmony and generate_harmonies run through the
+        int8 interpreter.
+        """
+        if not calibration_inputs:
+            raise ValueError("At least one calibration input is required")
+        self._validate_batch(calibration_inputs)
+
+        def representative_dataset():
+            for input_data in calibration_inputs:
+                yield [self._process_input(input_data)[None, :]]
+
+        import tensorflow as tf
+
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+            self._install_int8(converter.convert())
+        except Exception as e:
+            logger.error("Failed to build int8 interpreter: %s", e)
+            raise
+        logger.info("Int8 interpreter enabled")
+
+    def _install_int8(self, model_content: bytes):
+        """Switch inference to a converted int8 TFLite model."""
+        with self._int8_lock:
+            self._int8_interpreters = {}
+            _, self._int8_input, self._int8_output = self._int8_interpreter(
+                1, model_content)
+            self._int8_model = model_content
+
+    def _new_int8_interpreter(self, model_content: bytes):
+        """Create a TFLite interpreter for the int8 model."""
+        import tensorflow as tf
+
+        return tf.lite.Interpreter(model_content=model_content)
+
+    def _int8_interpreter(self, size: int, model_content: bytes = None):
+        """
+        Get the interpreter for one batch bucket, creating it on first use.
+        Each bucket size has its own interpreter, resized once, so alternating
+        single and batched calls never resize a shared one back and forth.
+        Callers must hold _int8_lock.
+        """
+        entry = self._int8_interpreters.get(size)
+        if entry is None:
+            interpreter = self._new_int8_interpreter(
+                model_content or self._int8_model)
+            input_details = interpreter.get_input_details()[0]
+            if input_details['shape'][0] != size:
+                interpreter.resize_tensor_input(input_details['index'],
+                                                (size, self._D))
+            interpreter.allocate_tensors()
+            entry = (interpreter, interpreter.get_input_details()[0],
+                     interpreter.get_output_details()[0])
+            self._int8_interpreters[size] = entry
+        return entry
+
     def _validate_input(self, input_data: MusicInput):
         """Validate the input data for consistency and completeness."""
-        if not input_data.melody or len(input_data.melody) < 5:
-            raise ValueError("Melody must contain at least 5 notes")
-        if not input_data.chords or len(input_data.chords) < 2:
-            raise ValueError("At least 2 chords are required")
-        if input_data.tempo < 40 or input_data.tempo > 240:
-            raise ValueError("Tempo must be between 40 and 240 BPM")
+        if not input_data.melody or len(input_data.melody) < MIN_MELODY:
+            raise ValueError(
+                f"Melody must contain at least {MIN_MELODY} notes")
+        if not input_data.chords or len(input_data.chords) < MIN_CHORDS:
+            raise ValueError(f"At least {MIN_CHORDS} chords are required")
+        if len(input_data.melody) > MAX_MELODY:
+            raise ValueError(f"Melody must contain at most {MAX_MELODY} notes")
+        if len(input_data.chords) > MAX_CHORDS:
+            raise ValueError(f"At most {MAX_CHORDS} chords are supported")
+        if input_data.tempo < MIN_TEMPO or input_data.tempo > MAX_TEMPO:
+            raise ValueError(
+                f"Tempo must be between {MIN_TEMPO} and {MAX_TEMPO} BPM")
         return True
     
+    def _validate_batch(self, batch: list[MusicInput]):
+        """Validate a batch of inputs in one vectorized check."""
+        count = len(batch)
+        melody = np.fromiter((len(input_data.melody) for input_data in batch),
+                             dtype=np.int64, count=count)
+        chords = np.fromiter((len(input_data.chords) for input_data in batch),
+                             dtype=np.int64, count=count)
+        tempo = np.fromiter((input_data.tempo for input_data in batch),
+                            dtype=np.int64, count=count)
+        failures = sorted(
+            (row, f"{name} outside {low}-{high}")
+            for name, values, low, high in (
+                ("melody length", melody, MIN_MELODY, MAX_MELODY),
+                ("chord count", chords, MIN_CHORDS, MAX_CHORDS),
+                ("tempo", tempo, MIN_TEMPO, MAX_TEMPO),
+            )
+            for row in np.flatnonzero((values < low) | (values > high))
+        )
+        if failures:
+            raise ValueError("Invalid rows: " + "; ".join(
+                f"row {row}: {reason}" for row, reason in failures))
+        return True
+
     def generate_harmony(self, input_data: MusicInput):
         """Generate harmony notes based on the provided musical input."""
         try:
             self._validate_input(input_data)
-            logging.info("Generating harmony with input: %s", input_data)
-            processed_input = self._process_input(input_data)
-            prediction = self.model.predict(processed_input)
+            logger.debug("Generating harmony with input: %s", input_data)
+            if self._int8_model is not None:
+                prediction = self._invoke_int8(
+                    self._process_input_int8(input_data))
+            else:
+                processed_input = self._process_input(input_data)
+                prediction = self._run_inference(processed_input[None, :])
             harmony_notes = self._convert_to_notes(prediction)
             return harmony_notes
         except Exception as e:
-            logging.error(f"Error generating harmony: {e}")
+            logger.error("Error generating harmony: %s", e)
             raise
     
-    def _process_input(self, input_data: MusicInput):
+    def generate_harmonies(self, inputs: list[MusicInput]) -> list[list[int]]:
+        """Generate harmony notes for several inputs with one batched call."""
+        if not inputs:
+            return []
+        try:
+            self._validate_batch(inputs)
+            logger.debug("Generating harmonies for %d inputs", len(inputs))
+            batch = self._process_inputs_batch(inputs)
+            if self._int8_model is not None:
+                predictions = self._invoke_int8(self._quantize_features(batch))
+            else:
+                predictions = self._run_inference(batch)
+            return [self._convert_to_notes(prediction)
+                    for prediction in np.array_split(predictions, len(inputs))]
+        except Exception as e:
+            logger.error("Error generating harmonies: %s", e)
+            raise
+
+    def _process_input(self, input_data: MusicInput) -> np.ndarray:
         """Convert input data to a format suitable for the model."""
-        melody = np.array(input_data.melody, dtype=np.float32)
-        chords = np.array([self._chord_to_vector(chord) for chord in input_data.chords], dtype=np.float32)
-        tempo = np.array([input_data.tempo], dtype=np.float32)
-        return np.concatenate([melody, chords, tempo])
+        return self._fill_features(input_data,
+                                   np.empty(self._D, dtype=np.float32))
     
-    def _chord_to_vector(self, chord: str) -> np.ndarray:
-        """Convert a chord name to a numerical vector."""
-        chord_map = {
-            "Cmaj7": [1, 0, 0, 0, 0, 0, 0],
-            "G7": [0, 1, 0, 0, 0, 0, 0],
-            "Am7": [0, 0, 1, 0, 0, 0, 0],
-            "D7": [0, 0, 0, 1, 0, 0, 0],
-            "Em7": [0, 0, 0, 0, 1, 0, 0],
-            "A7": [0, 0, 0, 0, 0, 1, 0],
-            "Fmaj7": [0, 0, 0, 0, 0, 0, 1]
-        }
-        return np.array(chord_map.get(chord, [0]*7), dtype=np.float32)
+    def _process_inputs_batch(self, batch: list[MusicInput]) -> np.ndarray:
+        """Build one (N, D) float32 array for a model call, in place."""
+        out = np.empty((len(batch), self._D), dtype=np.float32)
+        for row, input_data in zip(out, batch):
+            self._fill_features(input_data, row)
+        return out
+
+    def _fill_features(self, input_data: MusicInput,
+                       out: np.ndarray) -> np.ndarray:
+        """Write melody, chord one-hots and tempo into out, zero-padded."""
+        n = len(input_data.melody)
+        m = len(input_data.chords) * _CHORD_WIDTH
+        out[:n] = input_data.melody
+        np.take(_CHORD_TABLE, self._chord_indices(input_data.chords), axis=0,
+                out=out[n:n + m].reshape(-1, _CHORD_WIDTH), mode='wrap')
+        out[n + m] = input_data.tempo
+        out[n + m + 1:] = 0.0
+        return out
+
+    def _process_input_int8(self, input_data: MusicInput) -> np.ndarray:
+        """Build a (1, D) int8 feature batch for the int8 interpreter."""
+        features = self._process_input(input_data)
+        return self._quantize_features(features)[None, :]
+
+    def _quantize_features(self, features: np.ndarray) -> np.ndarray:
+        """Quantize float features to the int8 input scale and zero point."""
+        scale, zero_point = self._int8_input['quantization']
+        quantized = np.round(features / scale) + zero_point
+        return np.clip(quantized, -128, 127).astype(np.int8)
+
+    def _invoke_int8(self, features: np.ndarray) -> np.ndarray:
+        """Run an (N, D) int8 batch through the interpreter, dequantized."""
+        return self._run_in_buckets(features, self._invoke_int8_bucket)
+
+    def _invoke_int8_bucket(self, features: np.ndarray) -> np.ndarray:
+        """Run one bucket-sized int8 batch under the interpreter lock."""
+        with self._int8_lock:
+            interpreter, input_details, output_details = (
+                self._int8_interpreter(len(features)))
+            interpreter.set_tensor(input_details['index'], features)
+            interpreter.invoke()
+            output = interpreter.get_tensor(output_details['index'])
+        scale, zero_point = self._int8_output['quantization']
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def _chord_indices(self, chords: list[str]) -> np.ndarray:
+        """Map chord names to rows of the one-hot chord table."""
+        return np.fromiter((_CHORD_INDEX.get(chord, -1) for chord in chords),
+                           dtype=np.int8, count=len(chords))
     
     def _convert_to_notes(self, prediction: np.ndarray) -> list[int]:
         """Convert model prediction to MIDI notes."""
-        return [int(note) for note in prediction.flatten()]
\ No newline at end of file
+        return self._convert_to_notes_array(prediction).tolist()
+
+    def _convert_to_notes_array(self, prediction: np.ndarray) -> np.ndarray:
+        """
+        Convert model prediction to a flat int32 array of MIDI notes.
+        NaN and infinite values have no integer equivalent and raise
+        ValueError; finite values are clipped to the MIDI range 0-127.
+        """
+        if not np.isfinite(prediction).all():
+            raise ValueError("Model prediction is NaN or infinite")
+        return np.clip(prediction, 0, 127).astype(np.int32).ravel()
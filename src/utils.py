@@ -1,45 +1,113 @@
 import logging
-from typing import List, Optional
-from pydantic import BaseModel
-import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-class Note(BaseModel):
+_VALID_PITCH = frozenset('ABCDEFG')
+_ACCIDENTALS = frozenset('#b')
+
+
+@dataclass(frozen=True)
+class Note:
     """Represents a musical note with pitch, accidental, and octave."""
     pitch: str
-    accidental: Optional[str] = None
     octave: int
+    accidental: Optional[str] = None
 
 def parse_note(note_str: str) -> Note:
     """
-    Parse a musical note string (e.g., 'C4', 'D#5', 'Eb2') into a Note model.
+    Parse a musical note string (e.g., 'C4', 'D#5', 'Eb2') into a Note.
     
     Args:
         note_str (str): The note string to parse.
         
     Returns:
-        Note: A Note model representing the parsed note.
+        Note: A Note representing the parsed note.
         
     Raises:
         ValueError: If the note string is invalid.
     """
     try:
-        match = re.match(r'^([A-Ga-g])([#b]?)(\d+)$', note_str)
-        if not match:
+        pitch = note_str[:1].upper()
+        if pitch not in _VALID_PITCH:
+            raise ValueError(f"Invalid note format: {note_str}")
+        accidental = note_str[1:2]
+        if accidental in _ACCIDENTALS:
+            octave_str = note_str[2:]
+        else:
+            accidental = ''
+            octave_str = note_str[1:]
+        if not (octave_str.isascii() and octave_str.isdigit()):
             raise ValueError(f"Invalid note format: {note_str}")
-        pitch = match.group(1).upper()
-        accidental = match.group(2)
-        octave = int(match.group(3))
-        if pitch not in 'ABCDEFG':
-            raise ValueError(f"Invalid pitch: {pitch}")
-        if accidental not in ['', '#', 'b']:
-            raise ValueError(f"Invalid accidental: {accidental}")
+        octave = int(octave_str)
         return Note(pitch=pitch, accidental=accidental, octave=octave)
     except Exception as e:
-        logging.error(f"Error parsing note {note_str}: {e}")
+        logger.error("Error parsing note %s: %s", note_str, e)
         raise
 
+
+def _scan_note(note_str: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Run the note grammar as a small DFA over a string.
+
+    States: 0 expects a pitch letter, 1 an optional accidental or a digit,
+    2 a digit, 3 further digits (accepting).
+
+    Returns:
+        Optional[Tuple[str, str, int]]: (pitch, accidental, octave), or None if
+        the string is not a valid note.
+    """
+    state = 0
+    pitch = accidental = ''
+    octave = 0
+    for ch in note_str:
+        if state == 0:
+            if ch not in 'ABCDEFGabcdefg':
+                return None
+            pitch = ch.upper()
+            state = 1
+        elif state == 1 and (ch == '#' or ch == 'b'):
+            accidental = ch
+            state = 2
+        elif '0' <= ch <= '9':
+            octave = octave * 10 + ord(ch) - 48
+            state = 3
+        else:
+            return None
+    if state != 3:
+        return None
+    return pitch, accidental, octave
+
+
+def parse_notes_bulk(note_strs: List[str]) -> List[Note]:
+    """
+    Parse a batch of note strings into Notes.
+
+    Each string is matched with a single pass of the note DFA.
+
+    Args:
+        note_strs (List[str]): The note strings to parse (e.g., ['C4', 'D#5']).
+
+    Returns:
+        List[Note]: The parsed notes, in input order.
+
+    Raises:
+        ValueError: If any note string is invalid.
+    """
+    notes = []
+    for note_str in note_strs:
+        parsed = _scan_note(note_str)
+        if parsed is None:
+            logger.error("Error parsing note %s: invalid note format",
+                         note_str)
+            raise ValueError(f"Invalid note format: {note_str}")
+        pitch, accidental, octave = parsed
+        notes.append(Note(pitch=pitch, accidental=accidental, octave=octave))
+    return notes
+
 def format_notes(notes: List[Note]) -> str:
     """
     Format a list of Note objects into a space-separated string representation.
@@ -63,11 +131,31 @@ def format_notes(notes: List[Note]) -> str:
             formatted.append(f"{pitch}{acc_str}{octave}")
         return ' '.join(formatted)
     except Exception as e:
-        logging.error(f"Error formatting notes: {e}")
+        logger.error("Error formatting notes: %s", e)
         raise
 
+# Scale degrees following the root, as (pitch, octave offset) pairs
+
+_MAJOR_TEMPLATE = (('D', 0), ('E', 0), ('F', 0), ('G', 0), ('A', 0), ('B', 0))
+_MINOR_TEMPLATE = (('D', 0), ('F', 0), ('G', 0), ('A', 0), ('B', 0), ('C', 1))
+_SCALE_TEMPLATES = {'major': _MAJOR_TEMPLATE, 'minor': _MINOR_TEMPLATE}
+
+# Semitone offsets from the root, used for MIDI output
+_MAJOR_INTERVALS = np.array([0, 2, 4, 5, 7, 9, 11], dtype=np.int32)
+_MINOR_INTERVALS = np.array([0, 2, 3, 5, 7, 8, 10], dtype=np.int32)
+_SCALE_INTERVAL_TABLE = {'major': _MAJOR_INTERVALS, 'minor': _MINOR_INTERVALS}
+_PITCH_TO_SEMITONE = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+_ACCIDENTAL_TO_SEMITONE = {'#': 1, 'b': -1}
+
+
+@lru_cache(maxsize=128)
+def _scale_degrees(scale_type: str, octave: int) -> Tuple[Note, ...]:
+    """Materialize the notes following the root for a scale type and octave."""
+    return tuple(Note(pitch=pitch, octave=octave + offset)
+                 for pitch, offset in _SCALE_TEMPLATES[scale_type])
+
 class Scale:
-    """Represents a musical scale with a root note and scale type."""
+    """Represents an immutable musical scale with a root and scale type."""
     
     def __init__(self, root: str, scale_type: str):
         """
@@ -76,41 +164,68 @@ class Scale:
         Args:
             root (str): The root note of the scale (e.g., 'C4').
             scale_type (str): The type of scale (e.g., 'major', 'minor').
+
+        Raises:
+            ValueError: If the root note or scale type is invalid.
+        """
+        self._root = root
+        self._scale_type = scale_type
+        self._scale_key = scale_type.lower()
+        if self._scale_key not in _SCALE_TEMPLATES:
+            raise ValueError(f"Unsupported scale type: {scale_type}")
+        self._root_note = parse_note(root)
+        self._notes = None
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def get(cls, root: str, scale_type: str) -> 'Scale':
+        """
+        Get a shared Scale for a root and scale type, built once per key.
+
+        Args:
+            root (str): The root note of the scale (e.g., 'C4').
+            scale_type (str): The type of scale (e.g., 'major', 'minor').
+
+        Returns:
+            Scale: The cached Scale instance.
         """
-        self.root = root
-        self.scale_type = scale_type
-        self.notes = self._generate_scale()
+        return cls(root, scale_type)
+
+    @property
+    def root(self) -> str:
+        """The root note the scale was built from; read-only."""
+        return self._root
+
+    @property
+    def scale_type(self) -> str:
+        """The scale type the scale was built from; read-only."""
+        return self._scale_type
+
+    @property
+    def notes(self) -> Tuple[Note, ...]:
+        """The scale notes, generated on first access."""
+        if self._notes is None:
+            self._notes = self._generate_scale()
+        return self._notes
     
-    def _generate_scale(self) -> List[Note]:
+    def _generate_scale(self) -> Tuple[Note, ...]:
         """Generate the scale notes based on root and scale type."""
-        try:
-            root_note = parse_note(self.root)
-            if self.scale_type.lower() == 'major':
-                return [
-                    root_note,
-                    Note(pitch='D', octave=root_note.octave),
-                    Note(pitch='E', octave=root_note.octave),
-                    Note(pitch='F', octave=root_note.octave),
-                    Note(pitch='G', octave=root_note.octave),
-                    Note(pitch='A', octave=root_note.octave),
-                    Note(pitch='B', octave=root_note.octave)
-                ]
-            elif self.scale_type.lower() == 'minor':
-                return [
-                    root_note,
-                    Note(pitch='D', octave=root_note.octave),
-                    Note(pitch='F', octave=root_note.octave),
-                    Note(pitch='G', octave=root_note.octave),
-                    Note(pitch='A', octave=root_note.octave),
-                    Note(pitch='B', octave=root_note.octave),
-                    Note(pitch='C', octave=root_note.octave + 1)
-                ]
-            else:
-                raise ValueError(f"Unsupported scale type: {self.scale_type}")
-        except Exception as e:
-            logging.error(f"Error generating scale: {e}")
-            raise
+        root_note = self._root_note
+        return (root_note, *_scale_degrees(self._scale_key, root_note.octave))
     
-    def get_notes(self) -> List[Note]:
-        """Get the list of notes in the scale."""
-        return self.notes
\ No newline at end of file
+    def get_notes(self) -> Tuple[Note, ...]:
+        """Get the notes in the scale."""
+        return self.notes
+
+    def to_midi(self) -> np.ndarray:
+        """
+        Get the scale as MIDI note numbers (C4 = 60) in one vectorized step.
+
+        Returns:
+            np.ndarray: int32 array of MIDI note numbers, starting at the root.
+        """
+        intervals = _SCALE_INTERVAL_TABLE[self._scale_key]
+        root = self._root_note
+        root_midi = ((root.octave + 1) * 12 + _PITCH_TO_SEMITONE[root.pitch]
+                     + _ACCIDENTAL_TO_SEMITONE.get(root.accidental, 0))
+        return intervals + root_midi
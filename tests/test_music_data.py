@@ -0,0 +1,77 @@
+"""Tests for music data models in src.models."""
+
+import numpy as np
+import pytest
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from src.models import NOTE_DTYPE, MusicNote, notes_to_array, validate_music_data
+
+
+@pytest.fixture
+def music_data():
+    chord = {"key": "C", "notes": [{"pitch": "G4", "duration": 0.5, "timing": 1.0}]}
+    return {
+        "notes": [{"pitch": "C4", "duration": 1.0, "timing": 0.0}],
+        "chords": [chord],
+        "rhythm": {"beats": [1.0, 0.5], "tempo": 120},
+    }
+
+
+class TestMusicNotePitch:
+    """Tests for MusicNote pitch validation."""
+
+    @pytest.mark.parametrize("pitch", ["C4", "A#3", "Bb10", "G0"])
+    def test_valid(self, pitch):
+        assert MusicNote(pitch=pitch, duration=1.0, timing=0.0).pitch == pitch
+
+    @pytest.mark.parametrize("pitch", ["", "H4", "c4", "C", "C#", "C4x", "C 4", "C٣"])
+    def test_invalid(self, pitch):
+        with pytest.raises(ValueError):
+            MusicNote(pitch=pitch, duration=1.0, timing=0.0)
+
+    def test_rejects_trailing_newline(self):
+        # The previous regex ended in '$', which also matches before a final '\n'
+        with pytest.raises(ValueError):
+            MusicNote(pitch="C4\n", duration=1.0, timing=0.0)
+
+
+class TestNotesToArray:
+    """Tests for notes_to_array."""
+
+    def test_structured_dtype(self):
+        arr = notes_to_array([
+            MusicNote(pitch="C4", duration=1.0, timing=0.0),
+            MusicNote(pitch="A#3", duration=0.5, timing=1.0),
+        ])
+        assert arr.dtype == NOTE_DTYPE
+        assert arr["pitch"].tolist() == ["C4", "A#3"]
+        features = structured_to_unstructured(arr[["duration", "timing"]])
+        assert features.dtype == np.float32
+        assert features.tolist() == [[1.0, 0.0], [0.5, 1.0]]
+
+    def test_rejects_pitch_longer_than_field(self):
+        note = MusicNote(pitch="C#100", duration=1.0, timing=0.0)
+        with pytest.raises(ValueError):
+            notes_to_array([note])
+
+    def test_empty(self):
+        arr = notes_to_array([])
+        assert arr.dtype == NOTE_DTYPE
+        assert arr.shape == (0,)
+
+
+class TestValidateMusicData:
+    """Tests for validate_music_data."""
+
+    def test_trusted_matches_validated(self, music_data):
+        trusted = validate_music_data(music_data, trusted=True)
+        assert trusted == validate_music_data(music_data)
+
+    def test_trusted_builds_nested_notes(self, music_data):
+        chord = validate_music_data(music_data, trusted=True)["chords"][0]
+        assert isinstance(chord.notes[0], MusicNote)
+
+    def test_invalid_pitch(self, music_data):
+        music_data["notes"][0]["pitch"] = "H4"
+        with pytest.raises(ValueError):
+            validate_music_data(music_data)
@@ -0,0 +1,326 @@
+"""Tests for MusicService with the model stubbed out, so TensorFlow is not needed."""
+
+import re
+import subprocess
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.services import (
+    _CHORD_TABLE,
+    BATCH_BUCKETS,
+    LEGACY_MODEL_PATH,
+    MAX_MELODY,
+    MODEL_PATH,
+    MusicInput,
+    MusicService,
+)
+
+
+class EchoModel:
+    """Stand-in for a Keras model that doubles the first three features."""
+
+    def __init__(self, width):
+        self.input_shape = (None, width)
+
+    def __call__(self, features):
+        return features[:, :3] * 2.0
+
+
+class FakeInterpreter:
+    """Minimal stand-in for tf.lite.Interpreter with identity quantization."""
+
+    resizes = 0
+
+    def __init__(self, width):
+        self.input_shape = (1, width)
+        self.busy = threading.Lock()
+
+    def resize_tensor_input(self, index, shape):
+        self.input_shape = tuple(shape)
+        FakeInterpreter.resizes += 1
+
+    def allocate_tensors(self):
+        pass
+
+    def get_input_details(self):
+        shape = np.array(self.input_shape)
+        return [{"index": 0, "shape": shape, "quantization": (1.0, -128)}]
+
+    def get_output_details(self):
+        return [{"index": 1, "quantization": (1.0, -128)}]
+
+    def set_tensor(self, index, value):
+        assert value.shape == self.input_shape
+        assert self.busy.acquire(blocking=False), "interpreter used concurrently"
+        self.value = value
+
+    def invoke(self):
+        time.sleep(0.001)  # let other threads run mid-call
+        self.output = self.value[:, :3].copy()
+
+    def get_tensor(self, index):
+        self.busy.release()
+        return self.output
+
+
+class StubMusicService(MusicService):
+    """MusicService with an EchoModel, so no TensorFlow is needed."""
+
+    model_width = 89
+
+    def __init__(self):
+        self.batch_sizes = []
+        super().__init__()
+
+    def _load_model(self):
+        return EchoModel(self.model_width)
+
+    def _build_inference_fn(self):
+        return self.model
+
+    def _call_model(self, features):
+        self.batch_sizes.append(len(features))
+        return self._infer(features)
+
+    def _new_int8_interpreter(self, model_content):
+        return FakeInterpreter(self._D)
+
+
+@pytest.fixture
+def service():
+    return StubMusicService()
+
+
+def make_input(melody=(60, 62, 64, 65, 67), chords=("Cmaj7", "G7"), tempo=120):
+    return MusicInput(melody=list(melody), chords=list(chords), tempo=tempo)
+
+
+class TestLoadModel:
+    """Tests for choosing between the SavedModel and the legacy .h5 file."""
+
+    @pytest.fixture
+    def loaded_paths(self, tmp_path, monkeypatch):
+        paths = []
+
+        def load_model(path, compile=True):
+            paths.append((path, compile))
+            return EchoModel(89)
+
+        models = types.SimpleNamespace(load_model=load_model)
+        fake_tf = types.SimpleNamespace(keras=types.SimpleNamespace(models=models))
+        monkeypatch.setitem(sys.modules, "tensorflow", fake_tf)
+        monkeypatch.chdir(tmp_path)
+        return paths
+
+    def load(self):
+        return MusicService.__new__(MusicService)._load_model()
+
+    def test_prefers_savedmodel(self, loaded_paths, tmp_path):
+        (tmp_path / MODEL_PATH).mkdir()
+        (tmp_path / LEGACY_MODEL_PATH).touch()
+        self.load()
+        assert loaded_paths == [(MODEL_PATH, False)]
+
+    def test_falls_back_to_h5(self, loaded_paths, tmp_path):
+        (tmp_path / LEGACY_MODEL_PATH).touch()
+        self.load()
+        assert loaded_paths == [(LEGACY_MODEL_PATH, False)]
+
+    def test_without_h5_loads_savedmodel_path(self, loaded_paths):
+        self.load()
+        assert loaded_paths == [(MODEL_PATH, False)]
+
+
+class TestModelWidth:
+    """Tests for checking the loaded model against the feature width."""
+
+    def test_matches_feature_width(self, service):
+        assert service._D == service.model.input_shape[-1] == 89
+
+    def test_rejects_other_width(self):
+        class NarrowService(StubMusicService):
+            model_width = 64
+
+        with pytest.raises(ValueError, match="width 64 .* width 89"):
+            NarrowService()
+
+
+class TestProcessInput:
+    """Tests for feature construction."""
+
+    def test_layout(self, service):
+        features = service._process_input(make_input())
+        assert features.shape == (service._D,)
+        assert features.dtype == np.float32
+        assert features[:5].tolist() == [60, 62, 64, 65, 67]
+        assert features[5:19].tolist() == [1] + [0] * 7 + [1] + [0] * 5
+        assert features[19] == 120
+        assert not features[20:].any()
+
+    def test_calls_do_not_share_buffers(self, service):
+        first = service._process_input(make_input())
+        service._process_input(make_input(melody=(1, 2, 3, 4, 5)))
+        assert first[0] == 60
+
+    def test_batch_matches_single(self, service):
+        inputs = [make_input(), make_input(melody=(50, 52, 53, 55, 57), tempo=90)]
+        batch = service._process_inputs_batch(inputs)
+        for row, input_data in zip(batch, inputs):
+            assert np.array_equal(row, service._process_input(input_data))
+
+    def test_chord_one_hots(self, service):
+        features = service._process_input(make_input(chords=("G7", "Unknown")))
+        assert features[5:12].tolist() == [0, 1, 0, 0, 0, 0, 0]
+        assert features[12:19].tolist() == [0] * 7
+
+    def test_chord_indices(self, service):
+        indices = service._chord_indices(["Cmaj7", "Fmaj7", "Unknown"])
+        assert indices.tolist() == [0, 6, -1]
+        assert np.array_equal(_CHORD_TABLE[indices[:2]], np.eye(7)[[0, 6]])
+
+
+class TestGenerateHarmonies:
+    """Tests for batched harmony generation."""
+
+    def test_matches_single_requests(self, service):
+        inputs = [make_input(), make_input(melody=(50, 52, 53, 55, 57), tempo=90)]
+        expected = [service.generate_harmony(i) for i in inputs]
+        assert service.generate_harmonies(inputs) == expected
+
+    def test_one_row_per_input(self, service):
+        inputs = [make_input(melody=(n, 62, 64, 65, 67)) for n in range(50, 55)]
+        harmonies = service.generate_harmonies(inputs)
+        assert [harmony[0] for harmony in harmonies] == [100, 102, 104, 106, 108]
+
+    def test_empty(self, service):
+        assert service.generate_harmonies([]) == []
+
+
+class TestConvertToNotes:
+    """Tests for turning predictions into MIDI notes."""
+
+    def test_truncates_and_clips_to_midi_range(self, service):
+        prediction = np.array([[60.7, -5.0, 1e10]], dtype=np.float32)
+        notes = service._convert_to_notes_array(prediction)
+        assert notes.dtype == np.int32
+        assert notes.tolist() == [60, 0, 127]
+
+    @pytest.mark.parametrize("value", [np.nan, np.inf, -np.inf])
+    def test_rejects_non_finite(self, service, value):
+        prediction = np.array([[60.0, value, 64.0]], dtype=np.float32)
+        with pytest.raises(ValueError):
+            service._convert_to_notes_array(prediction)
+
+
+class TestValidateBatch:
+    """Tests for _validate_batch."""
+
+    @pytest.mark.parametrize("input_data", [
+        make_input(melody=(60, 62)),
+        make_input(melody=range(MAX_MELODY + 1)),
+        make_input(chords=("Cmaj7",)),
+        make_input(tempo=39),
+        make_input(tempo=241),
+    ])
+    def test_agrees_with_scalar_validation(self, service, input_data):
+        with pytest.raises(ValueError):
+            service._validate_input(input_data)
+        with pytest.raises(ValueError):
+            service._validate_batch([input_data])
+
+    def test_valid(self, service):
+        assert service._validate_batch([make_input(), make_input(tempo=40)])
+
+    def test_reports_failed_bound_per_row(self, service):
+        inputs = [
+            make_input(),
+            make_input(tempo=300),
+            make_input(),
+            make_input(melody=range(MAX_MELODY + 1), chords=("Cmaj7",)),
+        ]
+        message = (
+            "Invalid rows: row 1: tempo outside 40-240; "
+            "row 3: chord count outside 2-8; row 3: melody length outside 5-32"
+        )
+        with pytest.raises(ValueError, match=re.escape(message)):
+            service.generate_harmonies(inputs)
+
+
+class TestBatchBuckets:
+    """Tests for padding model calls to the compiled batch sizes."""
+
+    def test_init_compiles_every_bucket(self, service):
+        assert service.batch_sizes == list(BATCH_BUCKETS)
+
+    def test_calls_only_use_bucket_sizes(self, service):
+        inputs = [make_input(melody=(n, 62, 64, 65, 67)) for n in range(40)]
+        service.batch_sizes.clear()
+        service.generate_harmony(inputs[0])
+        service.generate_harmonies(inputs[:3])
+        harmonies = service.generate_harmonies(inputs)
+        assert service.batch_sizes == [1, 8, 32, 8]
+        assert [harmony[0] for harmony in harmonies] == [2 * n for n in range(40)]
+
+
+class TestInt8Path:
+    """Tests for routing through an enabled int8 interpreter."""
+
+    @pytest.fixture
+    def int8_service(self, service, monkeypatch):
+        monkeypatch.setattr(FakeInterpreter, "resizes", 0)
+        service._install_int8(b"int8 model")
+        return service
+
+    def test_batch_uses_interpreter(self, int8_service):
+        inputs = [make_input(), make_input(melody=(50, 52, 53, 55, 57))]
+        harmonies = int8_service.generate_harmonies(inputs)
+        assert harmonies == [[60, 62, 64], [50, 52, 53]]
+        assert int8_service.batch_sizes == list(BATCH_BUCKETS)
+
+    def test_single_matches_batch(self, int8_service):
+        inputs = [make_input(), make_input(melody=(50, 52, 53, 55, 57))]
+        single = [int8_service.generate_harmony(i) for i in inputs]
+        assert int8_service.generate_harmonies(inputs) == single
+
+    def test_alternating_calls_resize_once_per_bucket(self, int8_service):
+        inputs = [make_input(melody=(n, 62, 64, 65, 67)) for n in range(3)]
+        for _ in range(5):
+            int8_service.generate_harmony(inputs[0])
+            int8_service.generate_harmonies(inputs)
+        assert FakeInterpreter.resizes == 1
+        assert sorted(int8_service._int8_interpreters) == [1, 8]
+
+    def test_concurrent_calls(self, int8_service):
+        inputs = [make_input(melody=(n, 62, 64, 65, 67)) for n in range(40, 80)]
+
+        def run(input_data):
+            return int8_service.generate_harmony(input_data)[0]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            firsts = list(pool.map(run, inputs))
+        assert firsts == list(range(40, 80))
+
+    def test_enable_int8_rejects_invalid_calibration_inputs(self, service):
+        with pytest.raises(ValueError, match="row 0: melody length"):
+            service.enable_int8([make_input(melody=range(MAX_MELODY + 1))])
+        with pytest.raises(ValueError):
+            service.enable_int8([])
+
+
+def test_import_does_not_load_tensorflow():
+    code = "import sys, src.services; print('tensorflow' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
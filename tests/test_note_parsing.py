@@ -0,0 +1,40 @@
+"""Tests for note parsing in src.utils."""
+
+import pytest
+
+from src.utils import Note, parse_note, parse_notes_bulk
+
+VALID_NOTES = ["C4", "a#3", "Eb2", "eb12", "G0", "B#10"]
+INVALID_NOTES = ["", "H4", "C", "C#", "Cb", "C4x", "#4", "Cb#4", "C٣", "C 4"]
+
+
+class TestParseNote:
+    """Tests for parse_note."""
+
+    @pytest.mark.parametrize("note_str, expected", [
+        ("C4", Note(pitch="C", octave=4, accidental="")),
+        ("a#3", Note(pitch="A", octave=3, accidental="#")),
+        ("Eb12", Note(pitch="E", octave=12, accidental="b")),
+    ])
+    def test_valid(self, note_str, expected):
+        assert parse_note(note_str) == expected
+
+    @pytest.mark.parametrize("note_str", INVALID_NOTES)
+    def test_invalid(self, note_str):
+        with pytest.raises(ValueError):
+            parse_note(note_str)
+
+
+class TestParseNotesBulk:
+    """Tests for parse_notes_bulk."""
+
+    def test_agrees_with_parse_note(self):
+        assert parse_notes_bulk(VALID_NOTES) == [parse_note(n) for n in VALID_NOTES]
+
+    @pytest.mark.parametrize("note_str", INVALID_NOTES)
+    def test_rejects_what_parse_note_rejects(self, note_str):
+        with pytest.raises(ValueError):
+            parse_notes_bulk(["C4", note_str])
+
+    def test_empty_batch(self):
+        assert parse_notes_bulk([]) == []
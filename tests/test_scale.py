@@ -0,0 +1,61 @@
+"""Tests for Scale construction and MIDI output."""
+
+import numpy as np
+import pytest
+
+from src.utils import Scale
+
+
+class TestScaleToMidi:
+    """Tests for Scale.to_midi."""
+
+    @pytest.mark.parametrize("root, scale_type, expected", [
+        ("C4", "major", [60, 62, 64, 65, 67, 69, 71]),
+        ("A3", "minor", [57, 59, 60, 62, 64, 65, 67]),
+        ("Eb3", "Minor", [51, 53, 54, 56, 58, 59, 61]),
+        ("F#2", "major", [42, 44, 46, 47, 49, 51, 53]),
+    ])
+    def test_values(self, root, scale_type, expected):
+        assert Scale(root, scale_type).to_midi().tolist() == expected
+
+    def test_dtype_is_int32(self):
+        assert Scale("C4", "major").to_midi().dtype == np.int32
+
+    def test_high_root_does_not_overflow(self):
+        midi = Scale("B8", "major").to_midi()
+        assert midi.dtype == np.int32
+        assert midi.tolist() == [119, 121, 123, 124, 126, 128, 130]
+
+    def test_unsupported_scale_type(self):
+        with pytest.raises(ValueError):
+            Scale("C4", "dorian")
+
+
+class TestScaleNotes:
+    """Tests for Scale note generation."""
+
+    def test_major_notes(self):
+        notes = Scale("C4", "major").get_notes()
+        assert isinstance(notes, tuple)
+        assert [n.pitch for n in notes] == ["C", "D", "E", "F", "G", "A", "B"]
+
+    def test_minor_wraps_to_next_octave(self):
+        assert Scale("C4", "minor").get_notes()[-1].octave == 5
+
+
+class TestScaleCache:
+    """Tests for shared Scale instances."""
+
+    def test_get_returns_cached_instance(self):
+        assert Scale.get("D3", "major") is Scale.get("D3", "major")
+
+    def test_get_distinguishes_keys(self):
+        assert Scale.get("D3", "major") is not Scale.get("D3", "minor")
+
+    @pytest.mark.parametrize("attr, value", [("root", "E3"), ("scale_type", "minor")])
+    def test_cached_instance_is_read_only(self, attr, value):
+        scale = Scale.get("D3", "major")
+        with pytest.raises(AttributeError):
+            setattr(scale, attr, value)
+        assert (scale.root, scale.scale_type) == ("D3", "major")
+        assert Scale.get("D3", "major").to_midi()[0] == 50